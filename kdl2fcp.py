@@ -16,10 +16,11 @@ import argparse
 import os
 import os.path
 import glob
+import pathlib
 import re
+import sys
 
-from bs4 import BeautifulSoup
-import xml.etree.ElementTree as ET
+from lxml import etree
 
 # =============================================================================
 #  Data model.
@@ -27,11 +28,15 @@ import xml.etree.ElementTree as ET
 
 
 class ClipFile:
+    __slots__ = ("resource_path",)
+
     def __init__(self, resource_path):
         self.resource_path = resource_path
 
 
 class Clip:
+    __slots__ = ("clip_id", "name", "resource", "duration")
+
     def __init__(self, clip_id, name, resource, duration):
         self.clip_id = clip_id
         self.name = name
@@ -40,6 +45,8 @@ class Clip:
 
 
 class Entry:
+    __slots__ = ("clip", "in_time", "out_time")
+
     def __init__(self, clip, in_time, out_time):
         self.clip = clip
         self.in_time = in_time
@@ -47,12 +54,16 @@ class Entry:
 
 
 class Track:
+    __slots__ = ("is_audio", "entries", "latest_out")
+
     def __init__(self, is_audio):
         self.is_audio = is_audio
         self.entries = []
+        self.latest_out = 0
 
     def addEntry(self, entry):
         self.entries.append(entry)
+        self.latest_out = max(self.latest_out, entry.out_time)
 
 
 class Project:
@@ -60,6 +71,8 @@ class Project:
         self.clips = {}
         self.tracks = []
         self.frame_rate = None
+        # Latest out-time of any entry in the project.
+        self.length = 0
 
         self.global_embed_counter = 0
         if self.global_embed_counter == 0:
@@ -77,34 +90,38 @@ class Project:
 
     def addTrack(self, track):
         self.tracks.append(track)
+        self.length = max(self.length, track.latest_out)
 
 
 # =============================================================================
 #  Kdenlive reader.
 # =============================================================================
-def selectFirst(node, selector):
-    values = node.select(selector)
-    if values:
-        return values[0]
-    return None
+# Producer properties kept by KdenliveReader.
+_PRODUCER_PROPERTIES = frozenset(
+    ("resource", "kdenlive:originalurl", "kdenlive:clipname", "video_index"))
 
-# ==============================================================================
-   # else:
-    #    return float(time_str) / frame_rate
+# Characters allowed in the "<speed>:" prefix of slow motion resources.
+_SLOMO_CHARS = frozenset("0123456789.")
 
 
 class KdenliveReader:
+    _TIME_RE = re.compile(r"(\d{2}):(\d{2}):(\d{2})\.(\d{3})")
+    # Producers of the tracks of a tractor, if it is an audio tractor.
+    _AUDIO_TRACK_PRODUCERS = etree.XPath(
+        "self::*[property[@name='kdenlive:audio_track']]//track/@producer", smart_strings=False)
 
-    def __init__(self, force_time_frames=False, force_time_timestamp=False, legacy_format=False):
+    def __init__(self, force_time_frames=False, force_time_timestamp=False, legacy_format=False, verbose=False):
         self.force_time_frames = force_time_frames if not force_time_timestamp else False
         self.force_time_timestamp = force_time_timestamp if not force_time_frames else False
         self.version = 0 if force_time_frames else 1
         self.legacy_format = legacy_format
-        self._parseTime = self._parseTimeFrames if self.time_parse_type == "frames" else self._parseTimeStr
+        self.verbose = verbose
 
     def _parseTimeStr(self, time_str, frame_rate):
-        pattern = re.compile(r"(\d\d):(\d\d):(\d\d).(\d\d\d)")
-        match = pattern.match(time_str)
+        # Fast path for the usual HH:MM:SS.mmm timestamps.
+        if len(time_str) == 12 and time_str[2] == ":" and time_str[5] == ":" and time_str[8] == ".":
+            return int(time_str[0:2])*3600 + int(time_str[3:5])*60 + int(time_str[6:8]) + int(time_str[9:12])/1000.0
+        match = KdenliveReader._TIME_RE.match(time_str)
         hours = int(match.group(1))
         minutes = int(match.group(2))
         seconds = int(match.group(3))
@@ -115,15 +132,43 @@ class KdenliveReader:
         return float(nr_frames) / frame_rate
 
     def read(self, filename):
-        self.soup = None
-        with open(filename, "r") as input_file:
-            content = input_file.read()
-            if self.time_parse_type == "auto":
-                if re.search(r"<property name=\"kdenlive:docproperties\.version\">0\.\d\d</property>", content, flags=re.M) or self.force_time_frames == True:
-                    self._parseTime = self._parseTimeFrames
-                    self.version = 0
-            self.soup = BeautifulSoup(content, "lxml")
         self.project = Project()
+        self.profile = None
+        self.producers = []
+        self.playlists = []
+        self.audio_tractors = []
+        doc_version = None
+
+        # Stream the document, keeping only what the parse steps below need
+        # from each top level element and dropping the element afterwards.
+        context = etree.iterparse(filename, events=("end",))
+        for event, elem in context:
+            tag = elem.tag
+            if tag == "property":
+                if elem.get("name") == "kdenlive:docproperties.version":
+                    doc_version = elem.text or ""
+                continue
+            elif tag == "profile":
+                self.profile = dict(elem.attrib)
+            elif tag == "producer":
+                self._readProducer(elem)
+            elif tag == "playlist":
+                self._readPlaylist(elem)
+            elif tag == "tractor":
+                self._readTractor(elem)
+
+            parent = elem.getparent()
+            if parent is not None and parent.getparent() is None:
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
+        self.resource_root = context.root.get("root")
+
+        time_parse_type = self.time_parse_type
+        if time_parse_type == "auto" and doc_version is not None and doc_version.startswith("0."):
+            time_parse_type = "frames"
+            self.version = 0
+        self._parseTime = self._parseTimeFrames if time_parse_type == "frames" else self._parseTimeStr
 
         self._parseSettings()
         self._parseProducers()
@@ -131,8 +176,26 @@ class KdenliveReader:
 
         return self.project
 
+    def _readProducer(self, producer):
+        record = {"id": producer.get("id"), "out": producer.get("out")}
+        for prop in producer.iterchildren("property"):
+            name = prop.get("name")
+            if name in _PRODUCER_PROPERTIES:
+                record.setdefault(name, prop.text or "")
+        self.producers.append(record)
+
+    def _readPlaylist(self, playlist):
+        entries = [(child.tag, dict(child.attrib))
+                   for child in playlist if child.tag in ("blank", "entry")]
+        self.playlists.append((playlist.get("id"), entries))
+
+    def _readTractor(self, tractor):
+        tracks = self._AUDIO_TRACK_PRODUCERS(tractor)
+        if tracks:
+            self.audio_tractors.append((tractor.get("id"), tracks))
+
     def _parseSettings(self):
-        profile = selectFirst(self.soup, "mlt > profile")
+        profile = self.profile
         self.project.frame_rate_num = int(profile["frame_rate_num"])
         self.project.frame_rate_den = int(profile["frame_rate_den"])
         self.project.frame_rate = float(
@@ -147,44 +210,56 @@ class KdenliveReader:
         self.resource_path_to_canonical_clip = {}
         self.clip_id_to_canonical_clip_id = {}
 
-        resource_root = selectFirst(self.soup, "mlt")["root"]
+        resource_root = self.resource_root
+        # Same result as os.path.join(resource_root, name) for relative names.
+        if not resource_root or resource_root.endswith(os.sep):
+            resource_prefix = resource_root or ""
+        else:
+            resource_prefix = resource_root + os.sep
+        resource_paths = {}
+        parse_time = self._parseTime
+        frame_rate = self.project.frame_rate
 
-        producers = self.soup.select("producer")
+        producers = self.producers
+        self.producers_by_id = {producer["id"]: producer for producer in producers}
         for producer in producers:
             clip_id = producer["id"]
             if clip_id == "black_track":
                 continue
-            clip_id = self.project.id_prefix + clip_id
+            clip_id = sys.intern(self.project.id_prefix + clip_id)
 
-            resource_name = selectFirst(
-                producer, "property[name=resource]").text
-            original = selectFirst(
-                producer, "property[name=\"kdenlive:originalurl\"]")
-            if original:
-                resource_name = original.text
+            resource_name = producer.get("resource", "")
+            original = producer.get("kdenlive:originalurl")
+            if original is not None:
+                resource_name = original
 
-            duration = self._parseTime(producer["out"], self.project.frame_rate)
+            duration = parse_time(producer["out"], frame_rate)
 
-            if re.match(r"[0-9.]+:", resource_name):
+            colon_idx = resource_name.find(":")
+            if colon_idx > 0 and _SLOMO_CHARS.issuperset(resource_name[:colon_idx]):
                 # TODO: preserve slow motion information somewhere.
-                colon_idx = resource_name.find(":")
                 resource_name = resource_name[colon_idx+1:]
 
-            resource_path = os.path.join(resource_root, resource_name)
+            resource_path = resource_paths.get(resource_name)
+            if resource_path is None:
+                if os.path.isabs(resource_name):
+                    resource_path = resource_name
+                else:
+                    resource_path = resource_prefix + resource_name
+                resource_paths[resource_name] = resource_path
             if resource_path in self.resource_path_to_canonical_clip:
                 canonical_clip = self.resource_path_to_canonical_clip[resource_path]
                 self.clip_id_to_canonical_clip_id[clip_id] = canonical_clip
             else:
                 clip_name = os.path.split(resource_path)[1]
-                clip_name_attr = selectFirst(
-                    producer, "property[name=\"kdenlive:clipname\"]")
-                if clip_name_attr:
-                    clip_name = clip_name_attr.text
+                clip_name_attr = producer.get("kdenlive:clipname")
+                if clip_name_attr is not None:
+                    clip_name = clip_name_attr
                     if not clip_name:
                         clip_name = os.path.basename(resource_path)
 
                 if EMBEDDED_MLT_TO_COMPOUND_CLIP and resource_path.endswith(".kdenlive"):
-                    reader = KdenliveReader()
+                    reader = KdenliveReader(verbose=self.verbose)
                     print("Reading embedded project:", resource_path)
                     resource = reader.read(resource_path)
                 else:
@@ -195,67 +270,64 @@ class KdenliveReader:
                 self.clip_id_to_canonical_clip_id[clip_id] = clip_id
                 self.resource_path_to_canonical_clip[resource_path] = clip_id
                 self.project.addClip(clip_id, clip)
-                print(clip_id, "->", resource_path)
+                if self.verbose:
+                    print(clip_id, "->", resource_path)
 
         print("Parsed", len(self.project.clips), "clips.")
 
     def _parseTracks(self):
         audio_playlist_ids = set()
-        tractors = self.soup.select("tractor")
-        for tractor in tractors:
-            is_audio_track = selectFirst(
-                tractor, "property[name=\"kdenlive:audio_track\"]")
-            if is_audio_track:
-                print(tractor["id"], "is audio")
-                tracks = tractor.select("track")
-                for track in tracks:
-                    audio_playlist_ids.add(track["producer"])
+        for tractor_id, tracks in self.audio_tractors:
+            if self.verbose:
+                print(tractor_id, "is audio")
+            audio_playlist_ids.update(tracks)
 
         print("Audio playlists:", audio_playlist_ids)
 
-        playlists = self.soup.select("playlist")
-
-        for playlist in playlists:
-            playlist_id = playlist["id"]
+        prefix = self.project.id_prefix
+        parse_time = self._parseTime
+        frame_rate = self.project.frame_rate
+        for playlist_id, entries in self.playlists:
             if playlist_id == "main_bin":
                 continue
             is_audio = playlist_id in audio_playlist_ids
-            entry = selectFirst(playlist, "entry")
             if self.legacy_format or self.version == 0:
-                if entry:
-                    producers = self.soup.select("producer")
-                    for producer in producers:
-                        if producer["id"] == entry["producer"]:
-                            video_index = selectFirst(producer, "property[name=video_index]")
-                            if video_index:
-                                is_audio = int(video_index.text) == -1
+                first_producer = next(
+                    (attrib.get("producer") for tag, attrib in entries if tag == "entry"), None)
+                if first_producer is not None:
+                    producer = self.producers_by_id.get(first_producer)
+                    if producer is not None:
+                        video_index = producer.get("video_index")
+                        if video_index is not None:
+                            is_audio = int(video_index) == -1
 
             track = Track(is_audio)
 
-            print("Playlist:", playlist_id,
-                  ("[audio]" if is_audio else "[video]"))
-            for entry in playlist.contents:
-                if entry.name == "blank":
+            if self.verbose:
+                print("Playlist:", playlist_id,
+                      ("[audio]" if is_audio else "[video]"))
+            for tag, entry in entries:
+                if tag == "blank":
                     # non so perche, ma questo sistema il problema della duration per i gaps
-                    length = self._parseTime(
-                        entry["length"], self.project.frame_rate) - (1.0 / self.project.frame_rate)
-                    print("\tBlank:", length)
+                    length = parse_time(entry["length"], frame_rate) - (1.0 / frame_rate)
+                    if self.verbose:
+                        print("\tBlank:", length)
                     entry = Entry(None, 0, length)
                     track.addEntry(entry)
-                elif entry.name == "entry":
-                    producer = self.project.id_prefix + entry["producer"]
+                elif tag == "entry":
+                    producer = prefix + entry["producer"] if prefix else entry["producer"]
                     clip_id = self.clip_id_to_canonical_clip_id[producer]
                     clip = self.project.getClip(clip_id)
-                    in_time = self._parseTime(
-                        entry["in"], self.project.frame_rate)
-                    out_time = self._parseTime(
-                        entry["out"], self.project.frame_rate)
-                    print("\t%s [%.3f - %.3f]" % (producer, in_time, out_time))
+                    in_time = parse_time(entry["in"], frame_rate)
+                    out_time = parse_time(entry["out"], frame_rate)
+                    if self.verbose:
+                        print("\t%s [%.3f - %.3f]" % (producer, in_time, out_time))
                     entry = Entry(clip, in_time, out_time)
                     track.addEntry(entry)
 
             if track.entries:
                 self.project.addTrack(track)
+
     @property
     def time_parse_type(self):
         if self.force_time_timestamp:
@@ -269,13 +341,13 @@ class KdenliveReader:
 # =============================================================================
 class FcpXmlWriter:
     def __init__(self, project, legacy_format):
-        self.xml = BeautifulSoup(features="xml")
+        self.root = None
         self.added_embedded_resources = set()
         self.project = project
         self.legacy_format = legacy_format
 
     def write(self, filename):
-        root = self._addTag(self.xml, "fcpxml", version="1.5")
+        self.root = root = etree.Element("fcpxml", version="1.5")
 
         resources_tag = self._addTag(root, "resources")
         self._addFormats(resources_tag)
@@ -283,121 +355,98 @@ class FcpXmlWriter:
 
         library = self._addTag(root, "library")
         self._addLibrary(library)
-        xml = self.xml.prettify()
-        self.write_xml(xml, filename)
-
-# =============================================================================
-# Remove unwanted elements. Done as a separate function because it easier to do the built-in module.
-# https://docs.python.org/3/library/xml.etree.elementtree.html
-# ============================================================================
-
-    def write_xml(self, xml, file_name):
-        tree = ET.ElementTree(ET.fromstring(xml))
-        if not self.legacy_format:
-            root = tree.getroot()
-            resources = root.findall("resources")[0]
-            spine = root.findall("library/event/project/sequence/spine")[0]
-            elms_to_remove = []
-            for child in resources.iter():
-                if child.attrib:
-                    if child.attrib.get("name", "") == "black":
-                        elms_to_remove.append(child)
-            for elm in elms_to_remove:
-                resources.remove(elm)
-            elms_to_remove = []
-            for child in spine.iter():
-                if child.attrib:
-                    elms_to_remove.append(child)
-                    if child.attrib.get("name", "") == "black":
-                        break
-            for elm in elms_to_remove:
-                spine.remove(elm)
-            for child in spine.iter():
-                if child.attrib:
-                    if child.attrib.get("name", "").split(".")[-1] in ["wav", "flac"]:
-                        child.tag = "audio"
-
-        tree.write(file_name, encoding='utf-8', xml_declaration=True)
+        etree.ElementTree(root).write(filename, encoding='utf-8', xml_declaration=True, pretty_print=True)
 
     def _addFormats(self, resources_tag):
         format_tag = self._addTag(resources_tag, "format")
-        format_tag["width"] = self.project.width
-        format_tag["height"] = self.project.height
-        format_tag["id"] = "r0"
-        format_tag["frameDuration"] = "%d/%ds" % (
-            self.project.frame_rate_den, self.project.frame_rate_num)
+        format_tag.set("width", str(self.project.width))
+        format_tag.set("height", str(self.project.height))
+        format_tag.set("id", "r0")
+        format_tag.set("frameDuration", "%d/%ds" % (
+            self.project.frame_rate_den, self.project.frame_rate_num))
 
     def _addResources(self, resources_tag):
         for clip_id, clip in self.project.clips.items():
             resource = clip.resource
             if isinstance(resource, ClipFile):
+                if not self.legacy_format and clip.name == "black":
+                    continue
                 asset = self._addTag(resources_tag, "asset")
-                asset["name"] = clip.name
-                asset["id"] = clip_id
-                asset["src"] = "file://" + resource.resource_path
-                asset["hasVideo"] = 1
-                asset["duration"] = self._formatTime(clip.duration)
-                asset["audioChannels"] = 2
-                asset["audioSources"] = 1
-                asset["hasAudio"] = 1
+                asset.set("name", clip.name)
+                asset.set("id", clip_id)
+                asset.set("src", "file://" + resource.resource_path)
+                asset.set("hasVideo", "1")
+                asset.set("duration", self._formatTime(clip.duration))
+                asset.set("audioChannels", "2")
+                asset.set("audioSources", "1")
+                asset.set("hasAudio", "1")
             elif isinstance(resource, Project):
                 self._addEmbeddedTimeline(clip_id, resources_tag)
 
     def _addEmbeddedTimeline(self, clip_id, resources_tag):
-        clip = project.clips[clip_id]
+        clip = self.project.clips[clip_id]
         embedded_project = clip.resource
-        writer = FcpXmlWriter(embedded_project)
+        writer = FcpXmlWriter(embedded_project, self.legacy_format)
         if embedded_project not in self.added_embedded_resources:
             self.added_embedded_resources.add(embedded_project)
             writer._addResources(resources_tag)
 
+        if not self.legacy_format and clip.name == "black":
+            return
+
         media = self._addTag(resources_tag, "media")
-        media["name"] = clip.name
-        media["id"] = clip_id
-        writer._addSequence(media, True)
+        media.set("name", clip.name)
+        media.set("id", clip_id)
+        # The black assets are not emitted, so drop the clips that use them.
+        writer._addSequence(media, True, drop_black=not self.legacy_format)
 
     def _addLibrary(self, library_tag):
         event = self._addTag(library_tag, "event")
-        event["name"] = "Timeline 1"
+        event.set("name", "Timeline 1")
         project_tag = self._addTag(event, "project")
-        project_tag["name"] = "Timeline 1"
-        self._addSequence(project_tag, False)
-
-    def _addSequence(self, project_tag, wrap_in_clip):
+        project_tag.set("name", "Timeline 1")
+        # Outside the legacy format, everything on the main timeline up to and
+        # including the first black clip is dropped, and wav/flac clips after
+        # it are emitted as audio.
+        clean = not self.legacy_format
+        self._addSequence(project_tag, False, skip_to_black=clean, retag_audio=clean)
+
+    def _addSequence(self, project_tag, wrap_in_clip, skip_to_black=False, retag_audio=False, drop_black=False):
         sequence = self._addTag(project_tag, "sequence")
-        sequence["format"] = "r0"
+        sequence.set("format", "r0")
         spine = self._addTag(sequence, "spine")
 
         if wrap_in_clip:
             wrapper = self._addTag(spine, "clip")
-            wrapper["duration"] = self._formatTime(self._getProjectLength())
+            wrapper.set("duration", self._formatTime(self.project.length))
         else:
             wrapper = spine
 
         index = 0
         for track in self.project.tracks:
-            self._addTrack(track, wrapper, index)
+            skip_to_black = self._addTrack(
+                track, wrapper, index, skip_to_black, retag_audio, drop_black)
             index += 1
 
-    # Computes the project length, given by the latest out-time it contains.
+    # Returns whether the next track should still skip up to the first black clip.
 
-    def _getProjectLength(self):
-        latest_out = 0
-        for track in self.project.tracks:
-            for entry in track.entries:
-                latest_out = max(latest_out, entry.out_time)
-        return latest_out
+    def _addTrack(self, track, spine, index, skip_to_black=False, retag_audio=False, drop_black=False):
+        inv_fr = 1.0 / self.project.frame_rate
+        fr_num = self.project.frame_rate_num
+        lane = str(index) if index > 0 else None
+
+        def formatTime(seconds):
+            return "%d/%ds" % (round(seconds * fr_num), fr_num)
 
-    def _addTrack(self, track, spine, index):
         offset = 0
         for entry in track.entries:
             clip = entry.clip
-            duration = entry.out_time - entry.in_time + \
-                (1.0 / self.project.frame_rate)
+            duration = entry.out_time - entry.in_time + inv_fr
 
+            attrs = {}
             if clip is None:
                 if ADD_GAP_NODES:
-                    clip_node = self._addTag(spine, "gap")
+                    clip_tag_name = "gap"
                 else:
                     offset += duration
                     continue
@@ -405,37 +454,51 @@ class FcpXmlWriter:
                 resource = clip.resource
                 if isinstance(resource, ClipFile):
                     clip_tag_name = "audio" if track.is_audio else "video"
-                    clip_node = self._addTag(spine, clip_tag_name)
                 elif isinstance(resource, Project):
-                    clip_node = self._addTag(spine, "ref-clip")
-                    clip_node["srcEnable"] = "audio" if track.is_audio else "video"
-                    self._addFakeTimemap(clip_node)
+                    clip_tag_name = "ref-clip"
+                    attrs["srcEnable"] = "audio" if track.is_audio else "video"
                 if track.is_audio:
-                    clip_node["srcCh"] = "1, 2"
+                    attrs["srcCh"] = "1, 2"
 
-                clip_node["name"] = clip.name
-                clip_node["ref"] = clip.clip_id
+                attrs["name"] = clip.name
+                attrs["ref"] = clip.clip_id
 
-            clip_node["start"] = self._formatTime(entry.in_time)
-            clip_node["duration"] = self._formatTime(duration)
-            clip_node["offset"] = self._formatTime(offset)
-            if index > 0:
-                clip_node["lane"] = index
+            attrs["start"] = formatTime(entry.in_time)
+            attrs["duration"] = formatTime(duration)
+            attrs["offset"] = formatTime(offset)
+            if lane is not None:
+                attrs["lane"] = lane
+
+            if skip_to_black:
+                skip_to_black = attrs.get("name") != "black"
+                offset += duration
+                continue
+            if drop_black and attrs.get("name") == "black":
+                offset += duration
+                continue
+            if retag_audio and attrs.get("name", "").split(".")[-1] in ["wav", "flac"]:
+                clip_tag_name = "audio"
+
+            clip_node = etree.SubElement(spine, clip_tag_name, attrs)
+            if clip_tag_name == "ref-clip":
+                self._addFakeTimemap(clip_node)
 
             offset += duration
 
+        return skip_to_black
+
     # Adds a <timeMap> node that forces Resolve to create a compound clip, although the speed we set is 100%.
 
     def _addFakeTimemap(self, clip_node):
         timemap = self._addTag(clip_node, "timeMap")
 
         timept = self._addTag(timemap, "timept")
-        timept["time"] = "0/1s"
-        timept["value"] = "0/1s"
+        timept.set("time", "0/1s")
+        timept.set("value", "0/1s")
 
         timept = self._addTag(timemap, "timept")
-        timept["time"] = "1/1s"
-        timept["value"] = "10/10s"
+        timept.set("time", "1/1s")
+        timept.set("value", "10/10s")
 
     def _formatTime(self, seconds):
         # TODO: use frame rate? Use GCD?
@@ -443,13 +506,11 @@ class FcpXmlWriter:
         return "%d/%ds" % (round(float(seconds) * self.project.frame_rate_num),    self.project.frame_rate_num)
 
     def _addTag(self, node, tagName, **attributes):
-        tag = self.xml.new_tag(tagName, **attributes)
-        node.append(tag)
-        return tag
+        return etree.SubElement(node, tagName, {k: str(v) for k, v in attributes.items()})
 
 
 def convert(file_name, out=None):
-    reader = KdenliveReader(force_time_frames=args.timing_as_framenumber, force_time_timestamp=args.timing_as_timestamp, legacy_format=args.legacy_format)
+    reader = KdenliveReader(force_time_frames=args.timing_as_framenumber, force_time_timestamp=args.timing_as_timestamp, legacy_format=args.legacy_format, verbose=args.verbose)
     project = reader.read(file_name)
     is_legacy = args.legacy_format
     print(reader.version)
@@ -480,21 +541,25 @@ if __name__ == "__main__":
 
     arg_parser.add_argument("-t", "--timing-as-timestamp", required=False, action="store_true",
                             help="Force timing information to be parsed as timestamp.")
+
+    arg_parser.add_argument("-v", "--verbose", required=False, action="store_true",
+                            help="Print every parsed clip, playlist and entry.")
     args = arg_parser.parse_args()
 
     EMBEDDED_MLT_TO_COMPOUND_CLIP = args.embedded_mlt_to_compound_clip
     ADD_GAP_NODES = args.add_gap_nodes
 
     for file_args in args.FILE:
-        for file in glob.glob(file_args):
+        for file in glob.iglob(file_args):
             if file:
+                output_path = pathlib.Path(file).with_suffix(".fcpxml")
                 if args.output:
                     if os.path.isdir(args.output):
-                        output_filename = os.path.join(args.output, os.path.splitext(file.rsplit(os.sep, 1)[-1])[0] + ".fcpxml")
+                        output_filename = str(pathlib.Path(args.output) / output_path.name)
                     else:
                         output_filename = args.output
                 else:
-                    output_filename = os.path.splitext(file)[0] + ".fcpxml"
+                    output_filename = str(output_path)
                 convert(file, output_filename)
             else:
                 print("Skipping glob %s as it doesn\'t exist" % file_args)